@@ -1,57 +1,71 @@
+import numpy as np
 import pandas as pd
+import functools
+import json
 from datetime import datetime
-import re
-from textblob import TextBlob
 import plotly.graph_objects as go
 import plotly.express as px
 import networkx as nx 
 import dash
 import dash_core_components as dcc
 import dash_html_components as html
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, State
+from filters import months, days_of_week, weekday_options, filter_mask
 
-# Load the CSV data into a DataFrame
-df = pd.read_csv('drought_tweet_sentiment.csv')
+# Load the enriched DataFrame written by build_dataset.py
+df = pd.read_parquet('drought_enriched.parquet')
 
-df['date'] = pd.to_datetime(df['date']).dt.tz_convert(None)
-
-# Add columns for month, year, day of the week, day name, and weekday/weekend indicators
-df['month'] = df['date'].dt.month
-df['year'] = df['date'].dt.year
-df['day_of_week'] = df['date'].dt.dayofweek
-df['day_name'] = df['date'].dt.day_name()
-df['is_weekend'] = df['date'].dt.dayofweek.isin([5, 6]).map({True: 'Weekend', False: 'Weekday'})
-df['hour'] = df['date'].dt.hour
-
-# Add tweet length column
-df['tweet_length'] = df['tweet'].apply(len)
-
-# Add hashtag count column
-df['hashtag_count'] = df['tweet'].apply(lambda x: len(re.findall(r'#(\w+)', x)))
-
-# Add mention count column
-df['mention_count'] = df['tweet'].apply(lambda x: len(re.findall(r'@(\w+)', x)))
-
-# Add word count column
-df['word_count'] = df['tweet'].apply(lambda x: len(x.split()))
-
-# Perform sentiment analysis and add columns for polarity and subjectivity
-df['polarity'] = df['tweet'].apply(lambda x: TextBlob(x).sentiment.polarity)
-df['subjectivity'] = df['tweet'].apply(lambda x: TextBlob(x).sentiment.subjectivity)
+# Figures for every filter combination, precomputed by build_dataset.py
+with open('drought_figures.json') as f:
+    FIG_CACHE = json.load(f)
 
 # Initialize the Dash app
 app = dash.Dash(__name__)
 server = app.server
 
-# Define the options for the filters
-months = {1: 'January', 2: 'February', 3: 'March', 4: 'April', 5: 'May', 6: 'June', 7: 'July', 8: 'August', 9: 'September', 10: 'October', 11: 'November', 12: 'December'}
-days_of_week = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-weekday_options = [{'label': 'Weekday', 'value': 'Weekday'}, {'label': 'Weekend', 'value': 'Weekend'}]
+@functools.lru_cache(maxsize=None)
+def _global_layout():
+    # Spring layout of the full association graph; filtered views reuse these positions
+    edge_df = df.dropna(subset=['source', 'target'])
+    nodes = np.unique(np.concatenate([edge_df['source'].to_numpy(), edge_df['target'].to_numpy()]))
+    G = nx.DiGraph()
+    G.add_nodes_from(nodes)
+    G.add_edges_from(zip(edge_df['source'].to_numpy(), edge_df['target'].to_numpy()))
+    pos = nx.spring_layout(G, seed=0)
+    return nodes, np.array([pos[node] for node in nodes]).reshape(-1, 2)
+
+# Association graph coordinates per filter combination, filled the first time each is requested
+LAYOUT_CACHE = {}
+
+def _network_layout(selected_month, selected_day_of_week, selected_weekday_weekend):
+    key = (selected_month, selected_day_of_week, selected_weekday_weekend)
+    if key not in LAYOUT_CACHE:
+        filtered_df = df[filter_mask(df, *key)].dropna(subset=['source', 'target'])
+        nodes, pos_arr = _global_layout()
+
+        # Map edge endpoints to global node ids and drop repeated edges, as a DiGraph would
+        src = np.searchsorted(nodes, filtered_df['source'].to_numpy())
+        dst = np.searchsorted(nodes, filtered_df['target'].to_numpy())
+        edges = np.unique(np.column_stack([src, dst]), axis=0)
+        visible, inv = np.unique(edges.ravel(), return_inverse=True)
+        node_adjacencies = np.bincount(inv, minlength=len(visible))
+
+        # Edge segments interleaved with NaN gaps so plotly draws them as separate lines
+        x0, y0 = pos_arr[edges[:, 0]].T
+        x1, y1 = pos_arr[edges[:, 1]].T
+        gap = np.full_like(x0, np.nan)
+        edge_x = np.stack([x0, x1, gap], axis=1).ravel()
+        edge_y = np.stack([y0, y1, gap], axis=1).ravel()
+
+        LAYOUT_CACHE[key] = (edge_x, edge_y, pos_arr[visible, 0], pos_arr[visible, 1], node_adjacencies)
+    return LAYOUT_CACHE[key]
 
 # Define the layout of the app
 app.layout = html.Div([
     html.H1("Data Visualizations"),
 
+    dcc.Store(id='fig-cache', data=FIG_CACHE),
+
     html.Div([
         html.Label("Select Month:"),
         dcc.Dropdown(
@@ -65,7 +79,7 @@ app.layout = html.Div([
         html.Label("Select Day of the Week:"),
         dcc.Dropdown(
             id='day-of-week-filter',
-            options=[{'label': day, 'value': day} for day in days_of_week],
+            options=[{'label': day, 'value': day_num} for day_num, day in enumerate(days_of_week)],
             value=None
         ),
     ]),
@@ -95,48 +109,42 @@ app.layout = html.Div([
     dcc.Graph(id='association-graph'),
 ])
 
-# Callbacks to update the graphs based on the filter selections
-@app.callback(
+# Swap the precomputed figures in the browser when the filters change
+app.clientside_callback(
+    """
+    function(selectedMonth, selectedDayOfWeek, selectedWeekdayWeekend, figCache) {
+        const key = [selectedMonth, selectedDayOfWeek, selectedWeekdayWeekend]
+            .map(value => value === null || value === undefined ? '' : String(value))
+            .join('|');
+        return figCache.figures[key].map(fig => ({
+            ...fig,
+            layout: {...fig.layout, template: figCache.template}
+        }));
+    }
+    """,
     Output('trend-from-date', 'figure'),
     Output('sentiment-by-country', 'figure'),
     Output('heatmap', 'figure'),
     Output('tweet-count', 'figure'),
+    Input('month-filter', 'value'),
+    Input('day-of-week-filter', 'value'),
+    Input('weekday-weekend-filter', 'value'),
+    State('fig-cache', 'data')
+)
+
+# Callback to update the association graph based on the filter selections
+@app.callback(
     Output('association-graph', 'figure'),
     Input('month-filter', 'value'),
     Input('day-of-week-filter', 'value'),
     Input('weekday-weekend-filter', 'value')
 )
-def update_graphs(selected_month, selected_day_of_week, selected_weekday_weekend):
-    filtered_df = df.copy()
-
-    if selected_month:
-        filtered_df = filtered_df[filtered_df['month'] == selected_month]
-    if selected_day_of_week:
-        filtered_df = filtered_df[filtered_df['day_of_week'] == selected_day_of_week]
-    if selected_weekday_weekend:
-        if selected_weekday_weekend == 'Weekday':
-            filtered_df = filtered_df[filtered_df['is_weekend'] == 'Weekday']
-        else:
-            filtered_df = filtered_df[filtered_df['is_weekend'] == 'Weekend']
-
-    # Recalculate necessary data for the graphs based on the filtered DataFrame
-    daily_tweet_count = filtered_df.groupby('date').size().reset_index(name='tweet_count')
-    country_sentiment = filtered_df.groupby('country')['polarity'].mean().reset_index(name='avg_sentiment')
-    numerical_columns = ['tweet_length', 'hashtag_count', 'mention_count', 'word_count', 'polarity', 'subjectivity', 'hour']
-    corr = filtered_df[numerical_columns].corr()
-    day_of_week_tweet_count = filtered_df['day_of_week'].value_counts().reset_index()
-    day_of_week_tweet_count.columns = ['day_of_week', 'tweet_count']
-
-    G = nx.from_pandas_edgelist(filtered_df, 'source', 'target', create_using=nx.DiGraph)
-
-    edge_x = []
-    edge_y = []
-
-    for edge in G.edges():
-        x0, y0 = G.nodes[edge[0]]['pos']
-        x1, y1 = G.nodes[edge[1]]['pos']
-        edge_x.extend([x0, x1, None])
-        edge_y.extend([y0, y1, None])
+def update_association_graph(selected_month, selected_day_of_week, selected_weekday_weekend):
+    # The bundled dataset has no edge list; show an empty graph until source/target columns exist
+    if not {'source', 'target'}.issubset(df.columns):
+        return go.Figure(layout=go.Layout(title='Association Graph (no source/target data)'))
+
+    edge_x, edge_y, node_x, node_y, node_adjacencies = _network_layout(selected_month, selected_day_of_week, selected_weekday_weekend)
 
     edge_trace = go.Scatter(
         x=edge_x, y=edge_y,
@@ -144,14 +152,6 @@ def update_graphs(selected_month, selected_day_of_week, selected_weekday_weekend
         hoverinfo='none',
         mode='lines')
 
-    node_x = []
-    node_y = []
-
-    for node in G.nodes():
-        x, y = G.nodes[node]['pos']
-        node_x.append(x)
-        node_y.append(y)
-
     node_trace = go.Scatter(
         x=node_x, y=node_y,
         mode='markers',
@@ -164,25 +164,19 @@ def update_graphs(selected_month, selected_day_of_week, selected_weekday_weekend
             size=10,
             colorbar=dict(
                 thickness=15,
-                title='Node Connections',
-                xanchor='left',
-                titleside='right'
+                title=dict(text='Node Connections', side='right'),
+                xanchor='left'
             ),
             line_width=2))
 
-    node_adjacencies = []
-    node_text = []
-    for node, adjacencies in enumerate(G.adjacency()):
-        node_adjacencies.append(len(adjacencies[1]))
-        node_text.append(f'Connections: {len(adjacencies[1])}')
+    node_text = [f'Connections: {adjacencies}' for adjacencies in node_adjacencies]
 
     node_trace.marker.color = node_adjacencies
     node_trace.text = node_text
 
     association_graph = go.Figure(data=[edge_trace, node_trace],
                                   layout=go.Layout(
-                                      title='Association Graph',
-                                      titlefont_size=16,
+                                      title=dict(text='Association Graph', font=dict(size=16)),
                                       showlegend=False,
                                       hovermode='closest',
                                       margin=dict(b=20, l=5, r=5, t=40),
@@ -195,7 +189,7 @@ def update_graphs(selected_month, selected_day_of_week, selected_weekday_weekend
                                       yaxis=dict(showgrid=False, zeroline=False, showticklabels=False))
                                   )
 
-    return fig1, fig2, fig3, fig4, association_graph
+    return association_graph
 
 # Run the app
 if __name__ == '__main__':
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+import re
+from textblob import TextBlob
+import plotly.graph_objects as go
+from plotly.io.json import to_json_plotly
+from filters import FILTER_KEYS, days_of_week, filter_mask, cache_key
+
+# Precompiled pattern for hashtags and mentions; the captured sigil tells them apart
+TAG_RE = re.compile(r'([#@])\w+')
+
+# Load the CSV data into a DataFrame
+df = pd.read_csv('drought_tweet_sentiment.csv')
+
+# Keep the tweets in an Arrow-backed string column
+df['tweet'] = df['tweet'].astype('string[pyarrow]')
+
+# Timestamps are ISO 8601 in UTC (e.g. 2020-04-25T02:01:03.000Z); an explicit format takes the fast parser
+df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%dT%H:%M:%S.%f%z', utc=True, cache=True).dt.tz_localize(None)
+
+# Add columns for month, year, day of the week, day name, and weekday/weekend indicators
+dow = df['date'].dt.dayofweek
+df['month'] = df['date'].dt.month
+df['year'] = df['date'].dt.year
+df['day_of_week'] = dow.astype('int8')
+df['day_name'] = df['date'].dt.day_name()
+df['is_weekend'] = pd.Categorical.from_codes((dow >= 5).astype('int8'), categories=['Weekday', 'Weekend'])
+df['hour'] = df['date'].dt.hour
+
+# Days since the epoch, an integer key for the daily trend aggregation
+df['date_day'] = df['date'].to_numpy().astype('datetime64[D]').astype(np.int32)
+
+# Store the filter columns as categoricals and small ints
+df['day_name'] = df['day_name'].astype('category')
+df['country'] = df['country'].astype('category')
+df['month'] = df['month'].astype('int8')
+df['year'] = df['year'].astype('int16')
+df['hour'] = df['hour'].astype('int8')
+
+# Add tweet length column; np.fromiter raises OverflowError rather than wrapping like astype
+df['tweet_length'] = np.fromiter(df['tweet'].str.len(), dtype=np.int16, count=len(df))
+
+# Add hashtag, mention and word count columns in a single pass over the tweets
+def _text_counts(text):
+    sigils = TAG_RE.findall(text)
+    return sigils.count('#'), sigils.count('@'), len(text.split())
+
+hashtag_counts, mention_counts, word_counts = zip(*[_text_counts(text) for text in df['tweet']])
+df['hashtag_count'] = np.fromiter(hashtag_counts, dtype=np.int8, count=len(df))
+df['mention_count'] = np.fromiter(mention_counts, dtype=np.int8, count=len(df))
+df['word_count'] = np.fromiter(word_counts, dtype=np.int16, count=len(df))
+
+# Perform sentiment analysis and add columns for polarity and subjectivity.
+# TextBlob runs once per distinct tweet and yields both scores in one pass.
+def _sentiment(text):
+    sentiment = TextBlob(text).sentiment
+    return sentiment.polarity, sentiment.subjectivity
+
+unique_tweets = df['tweet'].drop_duplicates()
+tweet_sentiment = pd.DataFrame(unique_tweets.map(_sentiment).tolist(),
+                               index=unique_tweets, columns=['polarity', 'subjectivity'], dtype=np.float32)
+df = df.merge(tweet_sentiment, left_on='tweet', right_index=True, how='left')
+
+# Persist the enriched DataFrame so the app loads typed columns instead of re-running the NLP
+df.to_parquet('drought_enriched.parquet', compression='zstd')
+
+# Keep the numeric features as one contiguous float32 block for the correlation heatmap
+numerical_columns = ['tweet_length', 'hashtag_count', 'mention_count', 'word_count', 'polarity', 'subjectivity', 'hour']
+NUMERIC = np.ascontiguousarray(df[numerical_columns].to_numpy(dtype=np.float32))
+
+# Polarity sums and counts per country and filter bucket, rolled up for the country sentiment chart
+AGG = df.groupby(['country', 'month', 'day_of_week', 'is_weekend'], observed=True)['polarity'].agg(['sum', 'count']).reset_index()
+
+def _correlation(mask):
+    # Pearson correlation of the selected rows of NUMERIC
+    sub = NUMERIC[mask]
+    if len(sub) < 2:
+        return np.full((sub.shape[1], sub.shape[1]), np.nan, dtype=np.float32)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.corrcoef(sub, rowvar=False).astype(np.float32)
+
+# Correlation matrices for every filter combination
+CORR_CACHE = {key: _correlation(filter_mask(df, *key)) for key in FILTER_KEYS}
+
+def _compute(selected_month, selected_day_of_week, selected_weekday_weekend):
+    mask = filter_mask(df, selected_month, selected_day_of_week, selected_weekday_weekend)
+    filtered_df = df[mask]
+    buckets = AGG[filter_mask(AGG, selected_month, selected_day_of_week, selected_weekday_weekend)]
+
+    # Recalculate necessary data for the graphs based on the filtered DataFrame
+    daily_tweet_count = filtered_df.groupby('date_day').size().reset_index(name='tweet_count')
+    country_totals = buckets.groupby('country', observed=True)[['sum', 'count']].sum()
+    country_sentiment = (country_totals['sum'] / country_totals['count']).reset_index(name='avg_sentiment')
+    corr = CORR_CACHE[(selected_month, selected_day_of_week, selected_weekday_weekend)]
+    day_of_week_tweet_count = filtered_df['day_of_week'].value_counts().sort_index().reset_index()
+    day_of_week_tweet_count.columns = ['day_of_week', 'tweet_count']
+
+    fig1 = go.Figure(go.Scatter(x=daily_tweet_count['date_day'].to_numpy().astype('datetime64[D]'), y=daily_tweet_count['tweet_count'], mode='lines'),
+                     layout=go.Layout(title='Tweets over Time'))
+    fig2 = go.Figure(go.Bar(x=country_sentiment['country'], y=country_sentiment['avg_sentiment']),
+                     layout=go.Layout(title='Average Sentiment by Country'))
+    fig3 = go.Figure(go.Heatmap(z=corr, x=numerical_columns, y=numerical_columns, colorscale='RdBu', zmin=-1, zmax=1),
+                     layout=go.Layout(title='Correlation of Tweet Features'))
+    fig4 = go.Figure(go.Bar(x=[days_of_week[day] for day in day_of_week_tweet_count['day_of_week']],
+                            y=day_of_week_tweet_count['tweet_count']),
+                     layout=go.Layout(title='Tweet Count by Day of the Week'))
+    figures = [fig.to_plotly_json() for fig in (fig1, fig2, fig3, fig4)]
+    for figure in figures:
+        # The shared template is shipped once in FIG_CACHE rather than with every figure
+        figure['layout'].pop('template', None)
+    return figures
+
+# Figures for every filter combination, loaded by app.py into the fig-cache store.
+# The shared plotly template is stored once and re-attached by the clientside callback.
+FIG_CACHE = {
+    'template': go.Figure().to_plotly_json()['layout']['template'],
+    'figures': {cache_key(*key): _compute(*key) for key in FILTER_KEYS},
+}
+
+with open('drought_figures.json', 'w') as f:
+    f.write(to_json_plotly(FIG_CACHE))
@@ -0,0 +1,25 @@
+import itertools
+import numpy as np
+
+# Define the options for the filters
+months = {1: 'January', 2: 'February', 3: 'March', 4: 'April', 5: 'May', 6: 'June', 7: 'July', 8: 'August', 9: 'September', 10: 'October', 11: 'November', 12: 'December'}
+days_of_week = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+weekday_options = [{'label': 'Weekday', 'value': 'Weekday'}, {'label': 'Weekend', 'value': 'Weekend'}]
+
+# Every filter combination the dropdowns can produce (None means unfiltered)
+FILTER_KEYS = list(itertools.product([None, *months], [None, *range(len(days_of_week))], [None, 'Weekday', 'Weekend']))
+
+def filter_mask(frame, selected_month, selected_day_of_week, selected_weekday_weekend):
+    # Combine the filters into one boolean mask over the rows of frame
+    mask = np.ones(len(frame), dtype=bool)
+    if selected_month is not None:
+        mask &= frame['month'].to_numpy() == selected_month
+    if selected_day_of_week is not None:
+        mask &= frame['day_of_week'].to_numpy() == selected_day_of_week
+    if selected_weekday_weekend is not None:
+        mask &= (frame['is_weekend'] == selected_weekday_weekend).to_numpy()
+    return mask
+
+def cache_key(selected_month, selected_day_of_week, selected_weekday_weekend):
+    # String key shared with the clientside callback in app.py; an unset dropdown maps to ''
+    return '|'.join('' if value is None else str(value) for value in (selected_month, selected_day_of_week, selected_weekday_weekend))